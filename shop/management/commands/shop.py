@@ -1,9 +1,6 @@
-from cms.models.static_placeholder import StaticPlaceholder
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
-from django.utils.module_loading import import_string
-from cmsplugin_cascade.models import CascadeClipboard
-from shop.management.utils import deserialize_to_placeholder
+from django.utils.functional import cached_property
 
 
 class MissingPage(CommandError):
@@ -25,12 +22,73 @@ class MissingPlugin(CommandError):
     """
 
 
+_PAGE_SCAFFOLD = (
+    # Menu Title, Page kwargs, (Main Plugin, Plugin Context), Breadcrumb Glossary
+    # In the page kwargs, 'apphook' names the base class of the CMS-App-Hook and 'parent_page'
+    # names the Command attribute holding the parent page. Both are resolved at runtime.
+    ("Cart",
+     {'reverse_id': 'shop-cart'},
+     ('ShopCartPlugin', {'render_type': 'editable'}),
+     {'render_type': 'soft-root'}),
+    ("Watch-List",
+     {'reverse_id': 'shop-watch-list'},
+     ('ShopCartPlugin', {'render_type': 'watch'}),
+     {'render_type': 'soft-root'}),
+    ("Your Orders",
+     {'apphook': 'OrderApp', 'reverse_id': 'shop-order', 'parent_page': 'personal_pages', 'in_navigation': True},
+     ('ShopOrderViewsPlugin', {}),
+     {'render_type': 'default'}),
+    ("Personal Details",
+     {'reverse_id': 'shop-customer-details', 'parent_page': 'personal_pages', 'in_navigation': True},
+     ('CustomerFormPlugin', {}),
+     {'render_type': 'default'}),
+    ("Change Password",
+     {'reverse_id': 'shop-password-change', 'parent_page': 'personal_pages', 'in_navigation': True},
+     ('ShopAuthenticationPlugin', {'form_type': 'password-change'}),
+     {'render_type': 'default'}),
+    ("Login",
+     {'reverse_id': 'shop-login', 'parent_page': 'impersonal_pages', 'in_navigation': True},
+     ('ShopAuthenticationPlugin', {'form_type': 'login'}),
+     {'render_type': 'default'}),
+    ("Register Customer",
+     {'reverse_id': 'shop-register-customer', 'parent_page': 'impersonal_pages', 'in_navigation': True},
+     ('ShopAuthenticationPlugin', {'form_type': 'register-user'}),
+     {'render_type': 'default'}),
+    ("Request Password Reset",
+     {'reverse_id': 'password-reset-request', 'parent_page': 'impersonal_pages', 'in_navigation': True},
+     ('ShopAuthenticationPlugin', {'form_type': 'password-reset-request'}),
+     {'render_type': 'default'}),
+    ("Confirm Password Reset",
+     {'apphook': 'PasswordResetApp', 'reverse_id': 'password-reset-confirm'},
+     ('ShopAuthenticationPlugin', {'form_type': 'password-reset-confirm'}),
+     {'render_type': 'default'}),
+    ("Payment Canceled",
+     {'reverse_id': 'shop-cancel-payment'},
+     ('HeadingPlugin', {'tag_type': "h2", 'content': "Your payment has been canceled"}),
+     {'render_type': 'default'}),
+)
+
+
 class Command(BaseCommand):
     help = "Commands for Django-SHOP."
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._installed_apphooks = {}
+        self._resolved_apphooks = {}
+        self._public_pages = {}
+        self._bound_plugins = {}
+
+    @cached_property
+    def public_languages(self):
+        from cms.utils.i18n import get_public_languages
+
+        return tuple(get_public_languages())
+
     def add_arguments(self, parser):
         parser.add_argument(
             'subcommand',
+            choices=('help', 'customers', 'check-pages', 'review-settings'),
             help="./manage.py shop [customers|check-pages|review-settings]",
         )
         parser.add_argument(
@@ -80,49 +138,74 @@ Usage:
             self.add_mandatory = options['add_missing'] or self.add_recommended
             self.personal_pages = self.impersonal_pages = None
             if self.add_recommended:
-                for k, msg in enumerate(self.create_recommended_pages(), 1):
-                    self.stdout.write(" {}. {}".format(k, msg))
-            for k, msg in enumerate(self.check_mandatory_pages(), 1):
-                self.stdout.write(" {}. {}".format(k, msg))
+                self.write_enumerated(self.create_recommended_pages())
+            self.write_enumerated(self.check_mandatory_pages())
         elif subcommand == 'review-settings':
             self.stdout.write("The following configuration settings must be fixed:")
-            for k, msg in enumerate(self.review_settings(), 1):
-                self.stdout.write(" {}. {}".format(k, msg))
-        else:
-            msg = "Unknown sub-command for shop. Use one of: customer check-pages review-settings"
-            self.stderr.write(msg.format(subcommand))
+            self.write_enumerated(self.review_settings())
+
+    def write_enumerated(self, messages):
+        """
+        Write the given messages as an enumerated list, each one as soon as it is produced.
+        """
+        for k, msg in enumerate(messages, 1):
+            self.stdout.write(" {}. {}".format(k, msg))
 
     def customers(self):
         """
         Entry point for subcommand ``./manage.py shop customers``.
         """
-        from shop.models.customer import CustomerModel
+        from django.db.models import Count, Q
+        from shop.models.customer import CustomerModel, CustomerState
+
+        data = CustomerModel.objects.aggregate(
+            total=Count('pk'),
+            active=Count('pk', filter=Q(user__is_active=True)),
+            staff=Count('pk', filter=Q(user__is_staff=True)),
+            registered=Count('pk', filter=Q(recognized=CustomerState.REGISTERED)),
+            guests=Count('pk', filter=Q(recognized=CustomerState.GUEST)),
+            anonymous=Count('pk', filter=Q(recognized=CustomerState.UNRECOGNIZED)),
+        )
 
-        data = dict(total=0, anonymous=0, active=0, staff=0, guests=0, registered=0, expired=0)
-        for customer in CustomerModel.objects.iterator():
-            data['total'] += 1
-            if customer.user.is_active:
-                data['active'] += 1
-            if customer.user.is_staff:
-                data['staff'] += 1
-            if customer.is_registered:
-                data['registered'] += 1
-            elif customer.is_guest:
-                data['guests'] += 1
-            elif customer.is_anonymous:
-                data['anonymous'] += 1
+        # only unrecognized customers can expire, and that requires a lookup in the session store
+        data['expired'] = 0
+        expired_pks = []
+        unrecognized_customers = CustomerModel.objects.filter(recognized=CustomerState.UNRECOGNIZED)
+        for customer in unrecognized_customers.select_related('user').iterator(chunk_size=2000):
             if customer.is_expired:
                 data['expired'] += 1
-                if self.delete_expired and customer.orders.count() == 0:
-                    customer.delete()
+                if self.delete_expired:
+                    expired_pks.append(customer.pk)
+        if expired_pks:
+            self.delete_expired_customers(expired_pks)
         msg = "Customers in this shop: total={total}, anonymous={anonymous}, expired={expired}, active={active}, guests={guests}, registered={registered}, staff={staff}."
         self.stdout.write(msg.format(**data))
 
+    def delete_expired_customers(self, pks, batch_size=1000):
+        """
+        Delete the expired customers referred by the given primary keys, unless they have orders.
+        Since expired customers are always unrecognized, this behaves like ``Customer.delete()``:
+        The referred User object is kept, if it is active, otherwise it is deleted too.
+        """
+        from django.contrib.auth import get_user_model
+        from shop.models.customer import CustomerModel
+
+        for offset in range(0, len(pks), batch_size):
+            batch = pks[offset:offset + batch_size]
+            get_user_model().objects.filter(
+                pk__in=batch,
+                is_active=False,
+                customer__orders__isnull=True,
+            ).delete()
+            CustomerModel.objects.filter(pk__in=batch, orders__isnull=True).delete()
+
     def create_recommended_pages(self):
         from cms.models.pagemodel import Page
-        from cms.utils.i18n import get_public_languages
+        from cms.models.static_placeholder import StaticPlaceholder
+        from cmsplugin_cascade.models import CascadeClipboard
+        from shop.management.utils import deserialize_to_placeholder
 
-        default_language = get_public_languages()[0]
+        default_language = self.public_languages[0]
 
         # create the HOME page
         if Page.objects.public().filter(is_home=True).exists():
@@ -214,11 +297,11 @@ Usage:
         Entry point for subcommand ``./manage.py shop check-pages``.
         """
         from cms.models.pagemodel import Page
-        from cms.models.pluginmodel import CMSPlugin
-        from cms.utils.i18n import get_public_languages
+        from cms.plugin_pool import plugin_pool
+        from cmsplugin_cascade.models import CascadeClipboard
 
         self._created_cms_pages = []
-        default_language = get_public_languages()[0]
+        default_language = self.public_languages[0]
 
         # check for catalog pages
         apphook = self.get_installed_apphook('CatalogListCMSApp')
@@ -243,48 +326,13 @@ Usage:
                 yield "There should be at least one published CMS page configured to use an Application inheriting from 'CatalogListCMSApp'."
 
         page_scaffold = [
-            # Menu Title, CMS-App-Hook or None, kwargs, Main Plugin, Plugin Context,
-            ("Cart",
-             {'reverse_id': 'shop-cart'},
-             ('ShopCartPlugin', {'render_type': 'editable'}),
-             {'render_type': 'soft-root'}),
-            ("Watch-List",
-             {'reverse_id': 'shop-watch-list'},
-             ('ShopCartPlugin', {'render_type': 'watch'}),
-             {'render_type': 'soft-root'}),
-            ("Your Orders",
-             {'apphook': self.get_installed_apphook('OrderApp'), 'reverse_id': 'shop-order', 'parent_page': self.personal_pages, 'in_navigation': True},
-             ('ShopOrderViewsPlugin', {}),
-             {'render_type': 'default'}),
-            ("Personal Details",
-             {'reverse_id': 'shop-customer-details', 'parent_page': self.personal_pages, 'in_navigation': True},
-             ('CustomerFormPlugin', {}),
-             {'render_type': 'default'}),
-            ("Change Password",
-             {'reverse_id': 'shop-password-change', 'parent_page': self.personal_pages, 'in_navigation': True},
-             ('ShopAuthenticationPlugin', {'form_type': 'password-change'}),
-             {'render_type': 'default'}),
-            ("Login",
-             {'reverse_id': 'shop-login', 'parent_page': self.impersonal_pages, 'in_navigation': True},
-             ('ShopAuthenticationPlugin', {'form_type': 'login'}),
-             {'render_type': 'default'}),
-            ("Register Customer",
-             {'reverse_id': 'shop-register-customer', 'parent_page': self.impersonal_pages, 'in_navigation': True},
-             ('ShopAuthenticationPlugin', {'form_type': 'register-user'}),
-             {'render_type': 'default'}),
-            ("Request Password Reset",
-             {'reverse_id': 'password-reset-request', 'parent_page': self.impersonal_pages, 'in_navigation': True},
-             ('ShopAuthenticationPlugin', {'form_type': 'password-reset-request'}),
-             {'render_type': 'default'}),
-            ("Confirm Password Reset",
-             {'apphook': self.get_installed_apphook('PasswordResetApp'), 'reverse_id': 'password-reset-confirm'},
-             ('ShopAuthenticationPlugin', {'form_type': 'password-reset-confirm'}),
-             {'render_type': 'default'}),
-            ("Payment Canceled",
-             {'reverse_id': 'shop-cancel-payment'},
-             ('HeadingPlugin', {'tag_type': "h2", 'content': "Your payment has been canceled"}),
-             {'render_type': 'default'}),
+            (page_title, self.resolve_page_attrs(page_attrs), content_attrs, breadcrumb_glossary)
+            for page_title, page_attrs, content_attrs, breadcrumb_glossary in _PAGE_SCAFFOLD
         ]
+        self.prefetch_public_pages(
+            [page_attrs['reverse_id'] for _, page_attrs, _, _ in page_scaffold],
+            [content_attrs[0] for _, _, content_attrs, _ in page_scaffold],
+        )
         for page_title, page_attrs, content_attrs, breadcrumb_glossary in page_scaffold:
             try:
                 page = self.check_page(page_title, **page_attrs)
@@ -310,9 +358,16 @@ Usage:
             except CommandError as exc:
                 yield str(exc)
 
-        # the checkout page must be found through the purchase button
-        for plugin in CMSPlugin.objects.filter(plugin_type='ShopProceedButton', language=default_language, placeholder__page__publisher_is_draft=False):
-            link = plugin.get_bound_plugin().glossary.get('link')
+        # the checkout page must be found through the purchase button; query the plugin's concrete
+        # model, so that its glossary is available without fetching each bound plugin separately
+        proceed_button_model = plugin_pool.get_plugin('ShopProceedButton').model
+        proceed_buttons = proceed_button_model.objects.filter(
+            plugin_type='ShopProceedButton',
+            language=default_language,
+            placeholder__page__publisher_is_draft=False,
+        )
+        for plugin in proceed_buttons.iterator(chunk_size=200):
+            link = plugin.glossary.get('link')
             if isinstance(link, dict) and link.get('type') == 'PURCHASE_NOW':
                 break
         else:
@@ -334,30 +389,79 @@ Usage:
             else:
                 yield "There should be at least one published CMS page containing a 'Proceed Button Plugin' for purchasing the cart's content."
 
+    def get_installed_apphook(self, base_apphook_name):
+        if base_apphook_name not in self._installed_apphooks:
+            # also remember a missing apphook, so that the pool is scanned only once per name
+            self._installed_apphooks[base_apphook_name] = self._find_installed_apphook(base_apphook_name)
+        apphook = self._installed_apphooks[base_apphook_name]
+        if apphook is None:
+            msg = "The project must register an AppHook inheriting from '{apphook_name}'"
+            raise MissingAppHook(msg.format(apphook_name=base_apphook_name))
+        return apphook
+
     @classmethod
-    def get_installed_apphook(cls, base_apphook_name):
+    def _find_installed_apphook(cls, base_apphook_name):
+        from django.utils.module_loading import import_string
         from cms.apphook_pool import apphook_pool
+
         base_apphook = import_string('shop.cms_apphooks.' + base_apphook_name)
 
         for apphook, _ in apphook_pool.get_apphooks():
             apphook = apphook_pool.get_apphook(apphook)
             if isinstance(apphook, base_apphook):
                 return apphook
-        else:
-            msg = "The project must register an AppHook inheriting from '{apphook_name}'"
-            raise MissingAppHook(msg.format(apphook_name=base_apphook_name))
 
-    def check_page(self, title, apphook=None, reverse_id=None, **kwargs):
+    def resolve_page_attrs(self, page_attrs):
+        """
+        Resolve the names used as ``apphook`` and ``parent_page`` in ``_PAGE_SCAFFOLD``.
+        """
+        page_attrs = dict(page_attrs)
+        if 'apphook' in page_attrs:
+            page_attrs['apphook'] = self.get_installed_apphook(page_attrs['apphook'])
+        if 'parent_page' in page_attrs:
+            page_attrs['parent_page'] = getattr(self, page_attrs['parent_page'])
+        return page_attrs
+
+    def prefetch_public_pages(self, reverse_ids, plugin_types, slot='Main Content'):
+        """
+        Fetch the published CMS pages for the given reverse IDs together with their placeholder
+        named ``slot`` and its plugins of the given types. This fills two caches used by
+        ``check_page`` and ``check_page_content``: ``self._public_pages`` by reverse ID, and
+        ``self._bound_plugins`` by primary key, fetched using one query per plugin type.
+        """
+        from django.db.models import Prefetch
         from cms.models.pagemodel import Page
+        from cms.models.placeholdermodel import Placeholder
+        from cms.models.pluginmodel import CMSPlugin
+        from cms.utils.plugins import downcast_plugins
+
+        # order by primary key and keep the first match, as `.first()` would have done
+        plugins = CMSPlugin.objects.filter(plugin_type__in=plugin_types).order_by('pk')
+        placeholders = Placeholder.objects.filter(slot=slot).order_by('pk')
+        placeholders = placeholders.prefetch_related(Prefetch('cmsplugin_set', queryset=plugins))
+        pages = Page.objects.public().filter(reverse_id__in=reverse_ids).order_by('pk')
+        pages = pages.prefetch_related(Prefetch('placeholders', queryset=placeholders))
+        for page in pages:
+            self._public_pages.setdefault(page.reverse_id, page)
+        plugins = [plugin for page in self._public_pages.values() for placeholder in page.placeholders.all()
+                   for plugin in placeholder.cmsplugin_set.all()]
+        self._bound_plugins.update((plugin.pk, plugin) for plugin in downcast_plugins(plugins))
+
+    def resolve_apphook(self, application_urls):
         from cms.apphook_pool import apphook_pool
 
-        page = Page.objects.public().filter(reverse_id=reverse_id).first()
+        if application_urls not in self._resolved_apphooks:
+            self._resolved_apphooks[application_urls] = apphook_pool.get_apphook(application_urls)
+        return self._resolved_apphooks[application_urls]
+
+    def check_page(self, title, apphook=None, reverse_id=None, **kwargs):
+        page = self._public_pages.get(reverse_id)
         if not page:
             msg = "There should be a published CMS page with a reference ID: '{reverse_id}'."
             raise MissingPage(msg.format(reverse_id=reverse_id))
 
         if apphook:
-            if not page.application_urls or apphook_pool.get_apphook(page.application_urls) is not apphook:
+            if not page.application_urls or self.resolve_apphook(page.application_urls) is not apphook:
                 msg = "Page on URL '{url}' must be configured to use CMSApp inheriting from '{apphook}'."
                 raise MissingAppHook(msg.format(url=page.get_absolute_url(), apphook=apphook.__class__))
 
@@ -366,30 +470,34 @@ Usage:
     def check_page_content(self, page, plugin_type, subset):
         from cms.plugin_pool import plugin_pool
 
-        placeholder = page.placeholders.filter(slot='Main Content').first()
+        # related objects may have been prefetched by `prefetch_public_pages`, hence filter in Python
+        placeholder = next((ph for ph in page.placeholders.all() if ph.slot == 'Main Content'), None)
         if not placeholder:
             msg = "Page on URL '{url}' does not contain any plugin."
             raise MissingPlugin(msg.format(url=page.get_absolute_url()))
 
         plugin_name = plugin_pool.get_plugin(plugin_type).name
+        plugins = {}
+        for plugin in placeholder.cmsplugin_set.all():
+            if plugin.plugin_type == plugin_type:
+                plugins.setdefault(plugin.language, plugin)
+        # the bound plugins have been fetched by `prefetch_public_pages`; a plugin missing there has no bound instance
         for language in page.get_languages():
-            plugin = placeholder.cmsplugin_set.filter(plugin_type=plugin_type, language=language).first()
+            plugin = self._bound_plugins.get(plugins[language].pk) if language in plugins else None
             if not plugin:
                 msg = "Page on URL '{url}' shall contain a plugin named '{plugin_name}'."
                 raise MissingPlugin(msg.format(url=page.get_absolute_url(), plugin_name=plugin_name))
 
-            glossary_items = plugin.get_bound_plugin().glossary.items()
-            if not all(item in glossary_items for item in subset.items()):
+            if not subset.items() <= plugin.glossary.items():
                 msg = "Plugin named '{plugin_name}' on page with URL '{url}' is misconfigured."
                 raise MissingPlugin(msg.format(url=page.get_absolute_url(), plugin_name=plugin_name))
 
     def get_or_create_page(self, title, apphook=None, reverse_id=None, parent_page=None, in_navigation=False, soft_root=False):
         from cms.api import create_page
         from cms.models.pagemodel import Page
-        from cms.utils.i18n import get_public_languages
 
         template = settings.CMS_TEMPLATES[0][0]
-        language = get_public_languages()[0]
+        language = self.public_languages[0]
         try:
             parent_node = parent_page.node if parent_page else None
             page = Page.objects.drafts().get(
@@ -416,10 +524,9 @@ Usage:
 
     def create_page_structure(self, page, slot='Main Content'):
         from cms.api import add_plugin
-        from cms.utils.i18n import get_public_languages
 
         placeholder = page.placeholders.get(slot=slot)
-        language = get_public_languages()[0]
+        language = self.public_languages[0]
         glossary = {
             'breakpoints': ['xs', 'sm', 'md', 'lg', 'xl'],
             'fluid': None,
@@ -433,10 +540,9 @@ Usage:
 
     def create_breadcrumb(self, page, glossary, slot='Breadcrumb'):
         from cms.api import add_plugin
-        from cms.utils.i18n import get_public_languages
 
         placeholder = page.placeholders.get(slot=slot)
-        language = get_public_languages()[0]
+        language = self.public_languages[0]
         return add_plugin(placeholder, 'BreadcrumbPlugin', language, glossary=glossary)
 
     def add_plugin(self, leaf_plugin, plugin_type, glossary):
@@ -444,24 +550,30 @@ Usage:
         if plugin_type:
             return add_plugin(leaf_plugin.placeholder, plugin_type, leaf_plugin.language, target=leaf_plugin, glossary=glossary)
 
-    @classmethod
-    def publish_in_all_languages(cls, page):
+    def publish_in_all_languages(self, page):
+        from django.db import transaction
         from cms.api import copy_plugins_to_language, create_title
-        from cms.utils.i18n import get_public_languages
-
-        languages = get_public_languages()
-        for language in languages[1:]:
-            create_title(language, page.get_title(), page, menu_title=None)
-            copy_plugins_to_language(page, languages[0], language)
-        for language in languages:
-            page.publish(language)
 
-    def assign_all_products_to_page(self, page):
+        languages = self.public_languages
+        base_language = languages[0]
+        with transaction.atomic():
+            for language in languages:
+                if language != base_language:
+                    create_title(language, page.get_title(), page, menu_title=None)
+                    copy_plugins_to_language(page, base_language, language)
+                page.publish(language)
+
+    def assign_all_products_to_page(self, page, batch_size=1000):
+        from itertools import islice
         from shop.models.product import ProductModel
         from shop.models.related import ProductPageModel
 
-        for product in ProductModel.objects.all():
-            ProductPageModel.objects.create(page=page, product=product)
+        product_ids = ProductModel.objects.values_list('pk', flat=True).iterator(chunk_size=5000)
+        while True:
+            batch = [ProductPageModel(page=page, product_id=pk) for pk in islice(product_ids, batch_size)]
+            if not batch:
+                break
+            ProductPageModel.objects.bulk_create(batch, batch_size=batch_size)
 
     def review_settings(self):
         from django.conf import settings
@@ -476,21 +588,25 @@ Usage:
         if 'sass_processor.finders.CssFinder' not in getattr(settings, 'STATICFILES_FINDERS', []):
             yield "settings.STATICFILES_FINDERS should contain 'sass_processor.finders.CssFinder'."
 
-        if 'node_modules' not in dict(getattr(settings, 'STATICFILES_DIRS', [])).keys():
+        # entries of STATICFILES_DIRS may be plain paths or tuples of (prefix, path)
+        if not any(isinstance(entry, (list, tuple)) and entry and entry[0] == 'node_modules'
+                   for entry in getattr(settings, 'STATICFILES_DIRS', [])):
             yield "settings.STATICFILES_DIRS should contain ('node_modules', '/…/node_modules')."
 
         if '/node_modules/' not in getattr(settings, 'NODE_MODULES_URL', ''):
             yield "settings.NODE_MODULES_URL should start with a URL pointing onto /…/node_modules/."
 
-        for template_engine in getattr(settings, 'TEMPLATES', []):
-            if template_engine['BACKEND'] != 'django.template.backends.django.DjangoTemplates':
-                continue
-            context_processors = template_engine['OPTIONS'].get('context_processors', [])
+        TEMPLATES = getattr(settings, 'TEMPLATES', [])
+        # the first engine using the Django Template backend is the default one
+        django_engine = next((template_engine for template_engine in TEMPLATES
+                              if template_engine['BACKEND'] == 'django.template.backends.django.DjangoTemplates'), None)
+        if django_engine:
+            context_processors = django_engine.get('OPTIONS', {}).get('context_processors', [])
             if 'shop.context_processors.customer' not in context_processors:
                 yield "'shop.context_processors.customer' is missing in 'context_processors' of the default Django Template engine."
             if 'shop.context_processors.shop_settings' not in context_processors:
                 yield "'shop.context_processors.shop_settings' is missing in 'context_processors' of the default Django Template engine."
-        for template_engine in getattr(settings, 'TEMPLATES', []):
+        for template_engine in TEMPLATES:
             if template_engine['BACKEND'] == 'post_office.template.backends.post_office.PostOfficeTemplates':
                 break
         else:
@@ -515,10 +631,12 @@ Usage:
             yield "settings.SERIALIZATION_MODULES['json'] should be set to 'shop.money.serializers'."
 
         REST_FRAMEWORK = getattr(settings, 'REST_FRAMEWORK', {})
-        if 'shop.rest.money.JSONRenderer' not in REST_FRAMEWORK.get('DEFAULT_RENDERER_CLASSES', []):
+        DEFAULT_RENDERER_CLASSES = REST_FRAMEWORK.get('DEFAULT_RENDERER_CLASSES', [])
+        DEFAULT_FILTER_BACKENDS = REST_FRAMEWORK.get('DEFAULT_FILTER_BACKENDS', [])
+        if 'shop.rest.money.JSONRenderer' not in DEFAULT_RENDERER_CLASSES:
             yield "settings.REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] should contain class 'shop.rest.money.JSONRenderer'."
 
-        if 'django_filters.rest_framework.DjangoFilterBackend' not in REST_FRAMEWORK.get('DEFAULT_FILTER_BACKENDS', []):
+        if 'django_filters.rest_framework.DjangoFilterBackend' not in DEFAULT_FILTER_BACKENDS:
             yield "settings.REST_FRAMEWORK['DEFAULT_FILTER_BACKENDS'] should contain class 'django_filters.rest_framework.DjangoFilterBackend'."
 
         if getattr(settings, 'REST_AUTH_SERIALIZERS', {}).get('LOGIN_SERIALIZER') != 'shop.serializers.auth.LoginSerializer':
@@ -544,8 +662,8 @@ Usage:
             yield "settings.SHOP_CART_MODIFIERS should contain a list with cart modifiers."
 
     def deserialize_to_placeholder(self, page, data, slot='Main Content'):
-        from cms.utils.i18n import get_public_languages
+        from shop.management.utils import deserialize_to_placeholder
 
-        language = get_public_languages()[0]
+        language = self.public_languages[0]
         placeholder = page.placeholders.get(slot=slot)
         deserialize_to_placeholder(placeholder, data, language)
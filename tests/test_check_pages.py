@@ -0,0 +1,69 @@
+import pytest
+from io import StringIO
+from cms.api import add_plugin, create_page
+from cms.models.pagemodel import Page
+from django.core.management import call_command
+
+CHECKOUT_MESSAGE = "There should be at least one published CMS page containing a 'Proceed Button Plugin' " \
+                   "for purchasing the cart's content."
+
+
+def create_published_page(title, reverse_id, plugin_type=None, glossary=None):
+    page = create_page(title, 'page.html', 'en', reverse_id=reverse_id)
+    placeholder, _ = page.placeholders.get_or_create(slot='Main Content')
+    if plugin_type:
+        add_plugin(placeholder, plugin_type, 'en', glossary=glossary)
+    page.publish('en')
+    return Page.objects.public().get(reverse_id=reverse_id)
+
+
+def check_pages():
+    out = StringIO()
+    call_command('shop', 'check-pages', stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+def test_configured_page():
+    """
+    Check that a properly configured mandatory page does not produce any message.
+    """
+    page = create_published_page("Cart", 'shop-cart', 'ShopCartPlugin', {'render_type': 'editable'})
+    output = check_pages()
+    assert "There should be a published CMS page with a reference ID: 'shop-cart'." not in output
+    assert "There should be a published CMS page with a reference ID: 'shop-watch-list'." in output
+    assert page.get_absolute_url() not in output
+    assert CHECKOUT_MESSAGE in output
+
+
+@pytest.mark.django_db
+def test_page_missing_plugin():
+    """
+    Check that a mandatory page without its main plugin is reported.
+    """
+    page = create_published_page("Cart", 'shop-cart')
+    output = check_pages()
+    msg = "Page on URL '{}' shall contain a plugin named 'Shopping Cart'."
+    assert msg.format(page.get_absolute_url()) in output
+
+
+@pytest.mark.django_db
+def test_page_misconfigured_plugin():
+    """
+    Check that a mandatory page whose main plugin has the wrong glossary is reported.
+    """
+    page = create_published_page("Cart", 'shop-cart', 'ShopCartPlugin', {'render_type': 'static'})
+    output = check_pages()
+    msg = "Plugin named 'Shopping Cart' on page with URL '{}' is misconfigured."
+    assert msg.format(page.get_absolute_url()) in output
+
+
+@pytest.mark.django_db
+def test_purchase_button():
+    """
+    Check that a published Proceed Button linking onto "Purchase Now" satisfies the checkout check.
+    """
+    glossary = {'button_type': 'btn-success', 'link': {'type': 'PURCHASE_NOW'}, 'link_content': "Purchase Now"}
+    create_published_page("Checkout", 'shop-checkout', 'ShopProceedButton', glossary)
+    output = check_pages()
+    assert CHECKOUT_MESSAGE not in output
@@ -1,8 +1,14 @@
 import pytest
+import string
+from decimal import Decimal
+from io import StringIO
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.sessions.backends.cache import SessionStore
-from shop.models.customer import VisitingCustomer
+from django.core.management import call_command
+from django.utils.crypto import get_random_string
+from shop.models.customer import CustomerState, VisitingCustomer
+from shop.models.order import OrderModel
 from testshop.models import Customer
 
 
@@ -117,3 +123,66 @@ def test_authenticated_visiting_customer(customer_factory, rf, session):
     assert customer.is_authenticated is True
     assert customer.is_recognized is True
     assert customer.is_registered is True
+
+
+def create_unrecognized_customer(user_factory, session_key, is_active=False):
+    username = Customer.objects.encode_session_key(session_key)
+    user = user_factory(username=username, is_active=is_active)
+    return Customer.objects.create(user=user, recognized=CustomerState.UNRECOGNIZED)
+
+
+def create_expired_customer(user_factory, is_active=False):
+    session_key = get_random_string(32, string.ascii_lowercase + string.digits)  # never saved, hence expired
+    customer = create_unrecognized_customer(user_factory, session_key, is_active=is_active)
+    assert customer.is_expired is True
+    return customer
+
+
+@pytest.mark.django_db
+def test_count_customers(customer_factory, user_factory, session):
+    """
+    Check that ``./manage.py shop customers`` counts the customers by their state.
+    """
+    customer_factory(user__is_staff=True)
+    Customer.objects.create(user=user_factory(is_active=False), recognized=CustomerState.GUEST)
+    create_unrecognized_customer(user_factory, session.session_key)
+    create_expired_customer(user_factory)
+    out = StringIO()
+    call_command('shop', 'customers', stdout=out)
+    assert out.getvalue().strip() == "Customers in this shop: total=4, anonymous=2, expired=1, active=1, " \
+                                     "guests=1, registered=1, staff=1."
+    assert Customer.objects.count() == 4
+
+
+@pytest.mark.django_db
+def test_delete_expired_inactive_customer(user_factory):
+    """
+    Check that deleting an expired customer also deletes its inactive user.
+    """
+    customer = create_expired_customer(user_factory, is_active=False)
+    call_command('shop', 'customers', delete_expired=True, stdout=StringIO())
+    assert Customer.objects.filter(pk=customer.pk).exists() is False
+    assert get_user_model().objects.filter(pk=customer.pk).exists() is False
+
+
+@pytest.mark.django_db
+def test_delete_expired_active_customer(user_factory):
+    """
+    Check that deleting an expired customer keeps its active user.
+    """
+    customer = create_expired_customer(user_factory, is_active=True)
+    call_command('shop', 'customers', delete_expired=True, stdout=StringIO())
+    assert Customer.objects.filter(pk=customer.pk).exists() is False
+    assert get_user_model().objects.filter(pk=customer.pk).exists() is True
+
+
+@pytest.mark.django_db
+def test_keep_expired_customer_with_orders(user_factory):
+    """
+    Check that an expired customer who placed an order is not deleted.
+    """
+    customer = create_expired_customer(user_factory)
+    OrderModel.objects.create(customer=customer, currency='EUR', _subtotal=Decimal(0), _total=Decimal(0))
+    call_command('shop', 'customers', delete_expired=True, stdout=StringIO())
+    assert Customer.objects.filter(pk=customer.pk).exists() is True
+    assert get_user_model().objects.filter(pk=customer.pk).exists() is True
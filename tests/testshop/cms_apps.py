@@ -0,0 +1,26 @@
+from django.conf.urls import url
+from cms.apphook_pool import apphook_pool
+from shop.cms_apphooks import CatalogListCMSApp, OrderApp, PasswordResetApp
+
+
+class CatalogListApp(CatalogListCMSApp):
+    def get_urls(self, page=None, language=None, **kwargs):
+        from shop.views.catalog import ProductListView
+
+        return [
+            url(r'^', ProductListView.as_view()),
+        ]
+
+apphook_pool.register(CatalogListApp)
+
+
+class ShopOrderApp(OrderApp):
+    pass
+
+apphook_pool.register(ShopOrderApp)
+
+
+class ShopPasswordResetApp(PasswordResetApp):
+    pass
+
+apphook_pool.register(ShopPasswordResetApp)